@@ -8,11 +8,34 @@ import numpy as np
 from pathlib import Path
 
 # Add src to path for imports
-ROOT = Path(__file__).resolve().parent
-sys.path.append(str(ROOT / "src"))
+ROOT = Path(__file__).parent
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
 
 from dataloaders.database_physics_dataloader import PhysicsDataLoader
 
+def column_stats(data):
+    """Column mean and std from a single sum / sum-of-squares pass."""
+    # Accumulated in float64 so E[x^2] - E[x]^2 stays accurate
+    n = len(data)
+    mean = data.sum(axis=0, dtype=np.float64) / n
+    var = np.einsum('ij,ij->j', data, data, dtype=np.float64) / n - mean * mean
+    return mean, np.sqrt(var)
+
+def normalize_in_order(chunks, order, mean, std):
+    """Normalize chunks straight into one pre-allocated array, laid out in the given order."""
+    out = np.empty((sum(len(chunk) for chunk in chunks), chunks[0].shape[1]), dtype=np.float32)
+    shift = mean.astype(np.float32)
+    scale = (1.0 / std).astype(np.float32)
+    
+    offset = 0
+    for i in order:
+        rows = out[offset:offset + len(chunks[i])]
+        np.subtract(chunks[i], shift, out=rows)
+        rows *= scale
+        offset += len(rows)
+    return out
+
 def prepare_data_for_ai():
     """Demonstrate how to prepare physics data for AI training."""
     print("🤖 Preparing Physics Data for AI Equation Discovery")
@@ -48,37 +71,35 @@ def prepare_data_for_ai():
     
     # Data normalization (important for neural networks)
     print("\n🔧 Data Preprocessing:")
-    states_mean = all_states.mean(axis=0)
-    states_std = all_states.std(axis=0)
-    derivatives_mean = all_derivatives.mean(axis=0)
-    derivatives_std = all_derivatives.std(axis=0)
+    states_mean, states_std = column_stats(all_states)
+    derivatives_mean, derivatives_std = column_stats(all_derivatives)
     
     print(f"States mean: {states_mean}")
     print(f"States std: {states_std}")
     print(f"Derivatives mean: {derivatives_mean}")
     print(f"Derivatives std: {derivatives_std}")
     
-    # Normalize data
-    states_normalized = (all_states - states_mean) / states_std
-    derivatives_normalized = (all_derivatives - derivatives_mean) / derivatives_std
+    # Shuffle whole trajectories (cheap) and normalize each one into its shuffled slot
+    state_chunks, derivative_chunks = loader.get_training_data(contiguous=False)  # per-trajectory views
+    order = np.random.default_rng().permutation(len(state_chunks))
+    states_normalized = normalize_in_order(state_chunks, order, states_mean, states_std)
+    derivatives_normalized = normalize_in_order(derivative_chunks, order, derivatives_mean, derivatives_std)
     
     print(f"Normalized states range: [{states_normalized.min():.3f}, {states_normalized.max():.3f}]")
     print(f"Normalized derivatives range: [{derivatives_normalized.min():.3f}, {derivatives_normalized.max():.3f}]")
     
     # Split into train/validation sets
     print("\n📚 Data Splitting:")
-    n_samples = len(all_states)
-    train_size = int(0.8 * n_samples)
-    
-    # Shuffle data
-    indices = np.random.permutation(n_samples)
-    train_idx = indices[:train_size]
-    val_idx = indices[train_size:]
-    
-    X_train = states_normalized[train_idx]
-    y_train = derivatives_normalized[train_idx]
-    X_val = states_normalized[val_idx]
-    y_val = derivatives_normalized[val_idx]
+    n_samples = len(states_normalized)
+    # Round up to the end of the trajectory holding the 80% mark, so none straddles the split
+    trajectory_ends = np.cumsum([len(state_chunks[i]) for i in order])
+    train_size = trajectory_ends[np.searchsorted(trajectory_ends, int(0.8 * n_samples))]
+    
+    # Data is already shuffled by trajectory, so the split is just two views
+    X_train = states_normalized[:train_size]
+    y_train = derivatives_normalized[:train_size]
+    X_val = states_normalized[train_size:]
+    y_val = derivatives_normalized[train_size:]
     
     print(f"Training set: {X_train.shape[0]} samples")
     print(f"Validation set: {X_val.shape[0]} samples")
@@ -8,61 +8,58 @@ import numpy as np
 from pathlib import Path
 
 # Add src to path for imports
-ROOT = Path(__file__).resolve().parent
-sys.path.append(str(ROOT / "src"))
+ROOT = Path(__file__).parent
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
 
-from simulate.oscillators import simulate_simple_harmonic, simulate_damped_oscillator
+from simulate.oscillators import simulate_simple_harmonic_batch, simulate_damped_oscillator_batch
 from dataloaders.database_physics_dataloader import PhysicsDataLoader
+from utils.enhanced_database import PhysicsDatabase
 
-def generate_sho_dataset(n_trajectories: int = 20):
+# Set to an int for a reproducible dataset
+SEED = None
+rng = np.random.default_rng(SEED)
+
+def generate_sho_dataset(n_trajectories: int = 20, db: PhysicsDatabase = None):
     """Generate diverse simple harmonic oscillator data."""
     print(f"Generating {n_trajectories} simple harmonic oscillator trajectories...")
     
-    trajectory_ids = []
-    for i in range(n_trajectories):
-        # Random parameters
-        k = np.random.uniform(0.5, 3.0)
-        m = np.random.uniform(0.5, 2.0) 
-        x0 = np.random.uniform(-2.0, 2.0)
-        v0 = np.random.uniform(-1.0, 1.0)
-        noise = np.random.uniform(0.0, 0.05)
-        
-        traj_id = simulate_simple_harmonic(
-            k=k, m=m, x0=x0, v0=v0, 
-            n_steps=1000, dt=0.01, noise=noise
-        )
-        trajectory_ids.append(traj_id)
+    # Random parameters, one entry per trajectory
+    k = rng.uniform(0.5, 3.0, n_trajectories)
+    m = rng.uniform(0.5, 2.0, n_trajectories)
+    x0 = rng.uniform(-2.0, 2.0, n_trajectories)
+    v0 = rng.uniform(-1.0, 1.0, n_trajectories)
+    noise = rng.uniform(0.0, 0.05, n_trajectories)
     
-    return trajectory_ids
+    return simulate_simple_harmonic_batch(
+        k=k, m=m, x0=x0, v0=v0,
+        n_steps=1000, dt=0.01, noise=noise, rng=rng, db=db
+    )
 
-def generate_damped_dataset(n_trajectories: int = 20):
+def generate_damped_dataset(n_trajectories: int = 20, db: PhysicsDatabase = None):
     """Generate diverse damped oscillator data."""
     print(f"Generating {n_trajectories} damped oscillator trajectories...")
     
-    trajectory_ids = []
-    for i in range(n_trajectories):
-        # Random parameters
-        omega = np.random.uniform(0.5, 2.0)
-        zeta = np.random.uniform(0.05, 0.5)  # Underdamped
-        x0 = np.random.uniform(-2.0, 2.0)
-        v0 = np.random.uniform(-1.0, 1.0)
-        noise = np.random.uniform(0.0, 0.05)
-        
-        traj_id = simulate_damped_oscillator(
-            omega=omega, zeta=zeta, x0=x0, v0=v0,
-            n_steps=1000, dt=0.01, noise=noise
-        )
-        trajectory_ids.append(traj_id)
+    # Random parameters, one entry per trajectory
+    omega = rng.uniform(0.5, 2.0, n_trajectories)
+    zeta = rng.uniform(0.05, 0.5, n_trajectories)  # Underdamped
+    x0 = rng.uniform(-2.0, 2.0, n_trajectories)
+    v0 = rng.uniform(-1.0, 1.0, n_trajectories)
+    noise = rng.uniform(0.0, 0.05, n_trajectories)
     
-    return trajectory_ids
+    return simulate_damped_oscillator_batch(
+        omega=omega, zeta=zeta, x0=x0, v0=v0,
+        n_steps=1000, dt=0.01, noise=noise, rng=rng, db=db
+    )
 
 def main():
     print("🎯 Generating Physics Training Dataset")
     print("=" * 40)
     
-    # Generate data
-    sho_ids = generate_sho_dataset(30)
-    damped_ids = generate_damped_dataset(30)
+    # Generate data through one shared database connection
+    db = PhysicsDatabase()
+    sho_ids = generate_sho_dataset(30, db)
+    damped_ids = generate_damped_dataset(30, db)
     
     # Check the results
     loader = PhysicsDataLoader()
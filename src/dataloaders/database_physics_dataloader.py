@@ -4,11 +4,12 @@ Simple data loader for physics simulation data from SQLite database.
 import numpy as np
 from pathlib import Path
 import sys
-from typing import Tuple, Optional, List, Dict, Any
+from typing import Tuple, Optional, List, Dict, Any, Iterator
 
 # Add src to path for imports
-ROOT = Path(__file__).resolve().parents[2]
-sys.path.append(str(ROOT / "src"))
+ROOT = Path(__file__).parent.parent.parent
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
 
 from utils.enhanced_database import PhysicsDatabase
 
@@ -18,26 +19,51 @@ class PhysicsDataLoader:
         if db_path is None:
             db_path = ROOT / "db" / "simulations.sqlite"
         self.db = PhysicsDatabase(str(db_path))
+        self._system_ids: Dict[str, int] = {}
+        # (system_name, contiguous) -> training data, valid for _cache_version only
+        self._training_cache: Dict[Tuple[Optional[str], bool], tuple] = {}
+        self._cache_version: Optional[Tuple[int, int]] = None
     
-    def get_training_data(self, system_name: str = None) -> Tuple[np.ndarray, np.ndarray]:
+    def get_training_data(self, system_name: str = None, contiguous: bool = True):
         """
         Get training data for AI models.
         Returns: (states, derivatives) for training equation discovery models.
+        contiguous=False returns per-trajectory lists of arrays (views where possible).
+        Results are cached until the database changes, so the arrays are read-only.
         """
+        # Any write invalidates every cached dataset, so stale copies are released at once
+        data_version = self.db.data_version
+        if data_version != self._cache_version:
+            self._training_cache.clear()
+            self._cache_version = data_version
+        
+        key = (system_name, contiguous)
+        if key not in self._training_cache:
+            self._training_cache[key] = self._load_training_data(system_name, contiguous)
+        return self._training_cache[key]
+    
+    def _load_training_data(self, system_name: Optional[str], contiguous: bool):
+        """Uncached body of get_training_data."""
         if system_name:
             # Get specific system
-            systems = self.db.list_systems()
-            system_id = None
-            for sys in systems:
-                if sys['name'] == system_name:
-                    system_id = sys['id']
-                    break
-            if system_id is None:
-                raise ValueError(f"System '{system_name}' not found")
-            return self.db.get_training_data(system_id)
+            states, derivatives = self.db.get_training_data(self._system_id(system_name), contiguous)
         else:
             # Get all data
-            return self.db.get_training_data()
+            states, derivatives = self.db.get_training_data(contiguous=contiguous)
+        
+        # Callers share the cached arrays
+        for array in ([states, derivatives] if contiguous else [*states, *derivatives]):
+            array.flags.writeable = False
+        return states, derivatives
+    
+    def iter_training_batches(self, system_name: str = None, batch_size: int = 8192,
+                              shard: Tuple[int, int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream (states, derivatives) mini-batches without loading the whole dataset.
+        See PhysicsDatabase.iter_training_batches for batch_size and shard.
+        """
+        system_id = self._system_id(system_name) if system_name else None
+        return self.db.iter_training_batches(system_id, batch_size, shard)
     
     def get_trajectory_data(self, trajectory_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific trajectory by ID."""
@@ -49,17 +75,16 @@ class PhysicsDataLoader:
     
     def get_system_data(self, system_name: str) -> List[Dict[str, Any]]:
         """Get all trajectories for a specific system."""
-        systems = self.db.list_systems()
-        system_id = None
-        for sys in systems:
-            if sys['name'] == system_name:
-                system_id = sys['id']
-                break
-        
-        if system_id is None:
-            raise ValueError(f"System '{system_name}' not found")
-            
-        return self.db.get_system_trajectories(system_id)
+        return self.db.get_system_trajectories(self._system_id(system_name))
+    
+    def _system_id(self, system_name: str) -> int:
+        """Look up a system's ID by name, caching hits."""
+        if system_name not in self._system_ids:
+            system_id = self.db.get_system_id(system_name)
+            if system_id is None:
+                raise ValueError(f"System '{system_name}' not found")
+            self._system_ids[system_name] = system_id
+        return self._system_ids[system_name]
     
     def get_stats(self) -> Dict[str, int]:
         """Get database statistics."""
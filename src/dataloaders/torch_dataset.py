@@ -0,0 +1,38 @@
+"""
+PyTorch adapter that streams physics training data from the SQLite database.
+Requires torch, which is not part of the core pipeline.
+"""
+import torch
+from torch.utils.data import IterableDataset, get_worker_info
+from pathlib import Path
+import sys
+from typing import Iterator, Tuple
+
+# Add src to path for imports
+ROOT = Path(__file__).parent.parent.parent
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
+
+from dataloaders.database_physics_dataloader import PhysicsDataLoader
+
+
+class PhysicsTorchDataset(IterableDataset):
+    """
+    Yields (states, derivatives) float32 tensor mini-batches straight from the database.
+    Batches are already formed, so wrap it as DataLoader(dataset, batch_size=None);
+    with num_workers > 0 each worker streams its own share of the trajectories.
+    """
+    def __init__(self, db_path: str = None, system_name: str = None, batch_size: int = 8192):
+        self.db_path = db_path
+        self.system_name = system_name
+        self.batch_size = batch_size
+    
+    def __iter__(self) -> Iterator[Tuple[torch.Tensor, torch.Tensor]]:
+        # Open the database here so every worker process gets its own connection
+        loader = PhysicsDataLoader(self.db_path)
+        worker = get_worker_info()
+        shard = (worker.id, worker.num_workers) if worker else None
+        
+        for states, derivatives in loader.iter_training_batches(
+                self.system_name, self.batch_size, shard):
+            yield torch.from_numpy(states), torch.from_numpy(derivatives)
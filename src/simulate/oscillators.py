@@ -2,17 +2,128 @@
 Simplified physics simulation that generates data directly to the database.
 No external files - everything stored in SQLite.
 """
+import math
 import numpy as np
-from scipy.integrate import odeint
 from pathlib import Path
 import sys
+import threading
+from typing import List, Optional
 
 # Add src to path for imports
-ROOT = Path(__file__).resolve().parents[2]
-sys.path.append(str(ROOT / "src"))
+ROOT = Path(__file__).parent.parent.parent
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
 
 from utils.enhanced_database import PhysicsDatabase
 
+# Noise source used when callers don't pass their own generator
+_DEFAULT_RNG = np.random.default_rng()
+
+# Database used when callers don't pass their own; opened on first use in each thread,
+# since a sqlite3 connection can only be used by the thread that created it
+_DEFAULT_DB = threading.local()
+
+
+def _default_db() -> PhysicsDatabase:
+    """This thread's PhysicsDatabase for simulators called without db=."""
+    db = getattr(_DEFAULT_DB, "db", None)
+    if db is None:
+        db = _DEFAULT_DB.db = PhysicsDatabase()
+    return db
+
+
+def _sho_solution(k, m, x0, v0, tau):
+    """Exact SHO state [x, v] at elapsed times tau after the initial conditions."""
+    omega = np.sqrt(k / m)
+    phase = omega * tau
+    cos_term, sin_term = np.cos(phase), np.sin(phase)
+    x = x0 * cos_term + (v0 / omega) * sin_term
+    v = -x0 * omega * sin_term + v0 * cos_term
+    return np.stack([x, v], axis=-1)
+
+
+def _damped_solution(omega, zeta, x0, v0, tau):
+    """
+    Exact damped oscillator state [x, v] at elapsed times tau.
+    Covers under-, critically and over-damped motion with one expression:
+    x = e^{-zeta*omega*t} * (x0*C(t) + (v0 + zeta*omega*x0)*S(t)), where C, S are
+    cos/sin (or cosh/sinh) of the damped frequency and S(t) -> t at critical damping.
+    """
+    decay = zeta * omega
+    omega_d_sq = omega**2 - decay**2
+    omega_d = np.sqrt(np.abs(omega_d_sq))
+    phase = omega_d * tau
+    underdamped = omega_d_sq >= 0
+    cos_term = np.where(underdamped, np.cos(phase), np.cosh(phase))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sin_term = np.where(underdamped, np.sin(phase), np.sinh(phase)) / omega_d
+    sin_term = np.where(omega_d == 0, tau, sin_term)
+
+    envelope = np.exp(-decay * tau)
+    x = envelope * (x0 * cos_term + (v0 + decay * x0) * sin_term)
+    v = envelope * (v0 * cos_term - (decay * v0 + omega**2 * x0) * sin_term)
+    return np.stack([x, v], axis=-1)
+
+
+def _compile_batch_kernels():
+    """Define the fused numba batch kernels; numba is imported here so only batch runs pay for it."""
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sho_batch_kernel(k, m, x0, v0, dt, out):
+        """Fused _sho_solution for a batch, written straight into out[n_trajectories, n_steps, 2]."""
+        n_trajectories, n_steps, _ = out.shape
+        for i in prange(n_trajectories):
+            omega = math.sqrt(k[i] / m[i])
+            b = v0[i] / omega
+            for j in range(n_steps):
+                phase = omega * j * dt
+                cos_term = math.cos(phase)
+                sin_term = math.sin(phase)
+                out[i, j, 0] = x0[i] * cos_term + b * sin_term
+                out[i, j, 1] = -x0[i] * omega * sin_term + v0[i] * cos_term
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _damped_batch_kernel(omega, zeta, x0, v0, dt, out):
+        """Fused _damped_solution for a batch, written straight into out[n_trajectories, n_steps, 2]."""
+        n_trajectories, n_steps, _ = out.shape
+        for i in prange(n_trajectories):
+            decay = zeta[i] * omega[i]
+            omega_d_sq = omega[i] ** 2 - decay ** 2
+            omega_d = math.sqrt(abs(omega_d_sq))
+            a = v0[i] + decay * x0[i]
+            b = decay * v0[i] + omega[i] ** 2 * x0[i]
+            for j in range(n_steps):
+                tau = j * dt
+                if omega_d_sq > 0:
+                    cos_term = math.cos(omega_d * tau)
+                    sin_term = math.sin(omega_d * tau) / omega_d
+                elif omega_d_sq < 0:
+                    cos_term = math.cosh(omega_d * tau)
+                    sin_term = math.sinh(omega_d * tau) / omega_d
+                else:
+                    cos_term = 1.0
+                    sin_term = tau
+                envelope = math.exp(-decay * tau)
+                out[i, j, 0] = envelope * (x0[i] * cos_term + a * sin_term)
+                out[i, j, 1] = envelope * (v0[i] * cos_term - b * sin_term)
+
+    return _sho_batch_kernel, _damped_batch_kernel
+
+
+_BATCH_KERNELS = None  # (sho, damped) once compiled, False if numba is not installed
+
+
+def _batch_kernels():
+    """Batch kernels, compiled on first use; None when numba is unavailable."""
+    global _BATCH_KERNELS
+    if _BATCH_KERNELS is None:
+        try:
+            _BATCH_KERNELS = _compile_batch_kernels()
+        except ImportError:  # numba is optional; batch simulators fall back to NumPy broadcasting
+            _BATCH_KERNELS = False
+    return _BATCH_KERNELS or None
+
 
 def simulate_simple_harmonic(
     k: float = 1.0,
@@ -22,13 +133,20 @@ def simulate_simple_harmonic(
     t0: float = 0.0,
     dt: float = 0.01,
     n_steps: int = 1000,
-    noise: float = 0.0
+    noise: float = 0.0,
+    use_analytic: bool = True,
+    rng: Optional[np.random.Generator] = None,
+    quantize: bool = False,
+    db: Optional[PhysicsDatabase] = None
 ) -> int:
     """
     Simulate a simple harmonic oscillator: x'' = - (k/m) * x
+    Uses the closed-form solution unless use_analytic=False, which integrates with odeint.
+    quantize=True stores the states as int16 (see PhysicsDatabase.add_trajectory).
     Returns trajectory ID from database.
     """
-    db = PhysicsDatabase()
+    if db is None:
+        db = _default_db()
     
     # Add system if not exists
     system_id = db.add_system(
@@ -42,18 +160,26 @@ def simulate_simple_harmonic(
     # time vector
     t = t0 + np.arange(n_steps) * dt
 
-    # ODE definition
-    def sho(state, t):
-        x, v = state
-        return [v, - (k/m) * x]
+    if use_analytic:
+        state_data = _sho_solution(k, m, x0, v0, t - t0)
+    else:
+        from scipy.integrate import odeint  # deferred: scipy.integrate is slow to import
+
+        # ODE definition; coefficients hoisted so each LSODA callback is one multiply
+        stiffness = k / m
 
-    # integrate
-    sol = odeint(sho, [x0, v0], t)
-    state_data = sol  # [position, velocity] for each time step
+        def sho(state, t):
+            return [state[1], -stiffness * state[0]]
+
+        # integrate
+        state_data = odeint(sho, [x0, v0], t)
+    # float32 [position, velocity] for each time step
+    state_data = state_data.astype(np.float32, copy=False)
 
     # add noise
     if noise > 0:
-        state_data += np.random.normal(scale=noise, size=state_data.shape)
+        rng = rng or _DEFAULT_RNG
+        state_data += noise * rng.standard_normal(state_data.shape, dtype=np.float32)
 
     # Store in database
     trajectory_id = db.add_trajectory(
@@ -63,6 +189,7 @@ def simulate_simple_harmonic(
         initial_conditions=np.array([x0, v0]),
         dt=dt,
         noise_level=noise,
+        quantize=quantize,
         parameters={"k": k, "m": m}
     )
     
@@ -78,13 +205,20 @@ def simulate_damped_oscillator(
     t0: float = 0.0,
     dt: float = 0.01,
     n_steps: int = 1000,
-    noise: float = 0.0
+    noise: float = 0.0,
+    use_analytic: bool = True,
+    rng: Optional[np.random.Generator] = None,
+    quantize: bool = False,
+    db: Optional[PhysicsDatabase] = None
 ) -> int:
     """
     Simulate a damped harmonic oscillator: x'' + 2*zeta*omega*x' + omega^2*x = 0
+    Uses the closed-form solution unless use_analytic=False, which integrates with odeint.
+    quantize=True stores the states as int16 (see PhysicsDatabase.add_trajectory).
     Returns trajectory ID from database.
     """
-    db = PhysicsDatabase()
+    if db is None:
+        db = _default_db()
     
     # Add system if not exists
     system_id = db.add_system(
@@ -98,18 +232,27 @@ def simulate_damped_oscillator(
     # time vector
     t = t0 + np.arange(n_steps) * dt
 
-    # ODE definition
-    def damped(state, t):
-        x, v = state
-        return [v, -2*zeta*omega*v - (omega**2)*x]
+    if use_analytic:
+        state_data = _damped_solution(omega, zeta, x0, v0, t - t0)
+    else:
+        from scipy.integrate import odeint  # deferred: scipy.integrate is slow to import
+
+        # ODE definition; coefficients hoisted so each LSODA callback is two multiplies
+        damping = 2 * zeta * omega
+        stiffness = omega**2
+
+        def damped(state, t):
+            return [state[1], -damping * state[1] - stiffness * state[0]]
 
-    # integrate
-    sol = odeint(damped, [x0, v0], t)
-    state_data = sol  # [position, velocity] for each time step
+        # integrate
+        state_data = odeint(damped, [x0, v0], t)
+    # float32 [position, velocity] for each time step
+    state_data = state_data.astype(np.float32, copy=False)
 
     # add noise
     if noise > 0:
-        state_data += np.random.normal(scale=noise, size=state_data.shape)
+        rng = rng or _DEFAULT_RNG
+        state_data += noise * rng.standard_normal(state_data.shape, dtype=np.float32)
 
     # Store in database
     trajectory_id = db.add_trajectory(
@@ -119,8 +262,137 @@ def simulate_damped_oscillator(
         initial_conditions=np.array([x0, v0]),
         dt=dt,
         noise_level=noise,
+        quantize=quantize,
         parameters={"omega": omega, "zeta": zeta}
     )
     
     print(f"✓ Damped oscillator saved to database: trajectory_id={trajectory_id}")
     return trajectory_id
+
+
+def simulate_simple_harmonic_batch(
+    k: np.ndarray,
+    m: np.ndarray,
+    x0: np.ndarray,
+    v0: np.ndarray,
+    t0: float = 0.0,
+    dt: float = 0.01,
+    n_steps: int = 1000,
+    noise: np.ndarray = 0.0,
+    rng: Optional[np.random.Generator] = None,
+    quantize: bool = False,
+    db: Optional[PhysicsDatabase] = None
+) -> List[int]:
+    """
+    Simulate many simple harmonic oscillators at once, one per entry of k/m/x0/v0/noise.
+    All trajectories are evaluated in a single (n_trajectories, n_steps) broadcast.
+    Returns trajectory IDs from database.
+    """
+    k, m, x0, v0, noise = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=float))
+                                                 for a in (k, m, x0, v0, noise)))
+    if db is None:
+        db = _default_db()
+    
+    # Add system if not exists
+    system_id = db.add_system(
+        name="simple_harmonic",
+        equation="x'' = - (k/m) * x",
+        state_dim=2,
+        parameters={"k": float(k[0]), "m": float(m[0])},
+        description="Simple harmonic oscillator"
+    )
+    
+    # time vector
+    t = t0 + np.arange(n_steps) * dt
+
+    # (n_trajectories, n_steps, 2) states
+    kernels = _batch_kernels()
+    if kernels:
+        state_data = np.empty((len(k), n_steps, 2), dtype=np.float32)
+        kernels[0](*map(np.ascontiguousarray, (k, m, x0, v0)), dt, state_data)
+    else:
+        state_data = _sho_solution(k[:, None], m[:, None], x0[:, None], v0[:, None], t - t0)
+        state_data = state_data.astype(np.float32, copy=False)
+
+    # add noise
+    rng = rng or _DEFAULT_RNG
+    state_data += rng.standard_normal(state_data.shape, dtype=np.float32) * noise[:, None, None]
+
+    # Store in database
+    trajectory_ids = db.add_trajectories(
+        system_id=system_id,
+        time_data=t,
+        state_data=state_data,
+        initial_conditions=np.stack([x0, v0], axis=1),
+        dt=dt,
+        noise_levels=noise,
+        quantize=quantize,
+        parameters=np.stack([k, m], axis=1)  # (k, m) per trajectory
+    )
+    
+    print(f"✓ {len(trajectory_ids)} SHO trajectories saved to database")
+    return trajectory_ids
+
+
+def simulate_damped_oscillator_batch(
+    omega: np.ndarray,
+    zeta: np.ndarray,
+    x0: np.ndarray,
+    v0: np.ndarray,
+    t0: float = 0.0,
+    dt: float = 0.01,
+    n_steps: int = 1000,
+    noise: np.ndarray = 0.0,
+    rng: Optional[np.random.Generator] = None,
+    quantize: bool = False,
+    db: Optional[PhysicsDatabase] = None
+) -> List[int]:
+    """
+    Simulate many damped harmonic oscillators at once, one per entry of omega/zeta/x0/v0/noise.
+    All trajectories are evaluated in a single (n_trajectories, n_steps) broadcast.
+    Returns trajectory IDs from database.
+    """
+    omega, zeta, x0, v0, noise = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=float))
+                                                       for a in (omega, zeta, x0, v0, noise)))
+    if db is None:
+        db = _default_db()
+    
+    # Add system if not exists
+    system_id = db.add_system(
+        name="damped_oscillator",
+        equation="x'' + 2*zeta*omega*x' + omega^2*x = 0",
+        state_dim=2,
+        parameters={"omega": float(omega[0]), "zeta": float(zeta[0])},
+        description="Damped harmonic oscillator"
+    )
+    
+    # time vector
+    t = t0 + np.arange(n_steps) * dt
+
+    # (n_trajectories, n_steps, 2) states
+    kernels = _batch_kernels()
+    if kernels:
+        state_data = np.empty((len(omega), n_steps, 2), dtype=np.float32)
+        kernels[1](*map(np.ascontiguousarray, (omega, zeta, x0, v0)), dt, state_data)
+    else:
+        state_data = _damped_solution(omega[:, None], zeta[:, None], x0[:, None], v0[:, None], t - t0)
+        state_data = state_data.astype(np.float32, copy=False)
+
+    # add noise
+    rng = rng or _DEFAULT_RNG
+    state_data += rng.standard_normal(state_data.shape, dtype=np.float32) * noise[:, None, None]
+
+    # Store in database
+    trajectory_ids = db.add_trajectories(
+        system_id=system_id,
+        time_data=t,
+        state_data=state_data,
+        initial_conditions=np.stack([x0, v0], axis=1),
+        dt=dt,
+        noise_levels=noise,
+        quantize=quantize,
+        parameters=np.stack([omega, zeta], axis=1)  # (omega, zeta) per trajectory
+    )
+    
+    print(f"✓ {len(trajectory_ids)} damped oscillator trajectories saved to database")
+    return trajectory_ids
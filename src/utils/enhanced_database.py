@@ -5,18 +5,103 @@ All data is stored directly in SQLite - no external files needed.
 import sqlite3
 import numpy as np
 import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterator, Sequence, Union
+
+
+def _to_blob(array: np.ndarray) -> sqlite3.Binary:
+    """Encode an array as raw float32 bytes for a BLOB column."""
+    return sqlite3.Binary(np.ascontiguousarray(array, dtype=np.float32).tobytes())
+
+
+def _quantize(array: np.ndarray) -> Tuple[sqlite3.Binary, float]:
+    """Encode an array as int16 bytes plus the scale that maps them back to floats."""
+    scale = float(np.abs(array).max()) / 32767 or 1.0
+    quantized = np.round(np.asarray(array) / scale).astype(np.int16)
+    return sqlite3.Binary(quantized.tobytes()), scale
+
+
+def _from_blob(value, shape: Tuple[Optional[int], ...] = (-1,),
+               scale: Optional[float] = None) -> np.ndarray:
+    """
+    Decode a BLOB column back to an array; legacy rows hold JSON text.
+    A scale marks int16-quantized data, decoded as int16 * scale.
+    """
+    if isinstance(value, str):
+        return np.array(json.loads(value))
+    if shape[0] is None:
+        shape = (-1,)
+    if scale is not None:
+        return np.frombuffer(value, dtype=np.int16).reshape(shape) * np.float32(scale)
+    return np.frombuffer(value, dtype=np.float32).reshape(shape)
+
+
+def _segment_gradient(states: np.ndarray, lengths: np.ndarray, dts: np.ndarray) -> np.ndarray:
+    """
+    np.gradient along axis 0 of back-to-back trajectories in one pass.
+    Matches calling np.gradient(traj, dt, axis=0) on each trajectory separately.
+    """
+    starts = np.cumsum(lengths) - lengths
+    ends = starts + lengths - 1
+    
+    derivatives = np.empty_like(states)
+    derivatives[1:-1] = (states[2:] - states[:-2]) / 2
+    # One-sided differences at each trajectory's edges, never across a boundary
+    derivatives[starts] = states[starts + 1] - states[starts]
+    derivatives[ends] = states[ends] - states[ends - 1]
+    derivatives /= np.repeat(dts, lengths)[:, None]
+    return derivatives
+
+
+# Known linear oscillators x'' = -damping*x' - stiffness*x, keyed by system name.
+# Each maps named parameter arrays to the (damping, stiffness) coefficient arrays.
+_OSCILLATOR_COEFFICIENTS = {
+    "simple_harmonic": lambda p: (0.0, p["k"] / p["m"]),
+    "damped_oscillator": lambda p: (2 * p["zeta"] * p["omega"], p["omega"] ** 2),
+}
+
 
 class PhysicsDatabase:
     def __init__(self, db_path: str = "db/simulations.sqlite"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection for the object's lifetime; autocommit unless inside _transaction()
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self._writes = 0
+        self._systems: Dict[int, Tuple[Optional[str], List[str]]] = {}
         self._init_tables()
     
+    @contextmanager
+    def _transaction(self):
+        """Run a block of statements as a single BEGIN/COMMIT on the shared connection."""
+        self._conn.execute("BEGIN")
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+    
+    @property
+    def data_version(self) -> Tuple[int, int]:
+        """Token that changes whenever trajectories are written, here or by another connection."""
+        # PRAGMA data_version only reflects commits made through other connections
+        external = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return self._writes, external
+    
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+    
     def _init_tables(self):
         """Initialize database tables - store all data directly in DB."""
-        with sqlite3.connect(self.db_path) as conn:
+        # WAL avoids an fsync per commit; must be set outside a transaction
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # Systems table - metadata about physical systems
@@ -37,10 +122,15 @@ class PhysicsDatabase:
                 CREATE TABLE IF NOT EXISTS trajectories (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     system_id INTEGER REFERENCES systems(id),
-                    initial_conditions TEXT NOT NULL,  -- JSON array [x0, v0, ...]
-                    time_data TEXT NOT NULL,           -- JSON array of time points
-                    state_data TEXT NOT NULL,          -- JSON array of state vectors [[x1,v1],[x2,v2],...]
-                    parameters TEXT,                   -- JSON string of simulation params
+                    initial_conditions BLOB NOT NULL,  -- float32 bytes [x0, v0, ...]
+                    time_data BLOB NOT NULL,           -- float32 bytes of time points
+                    state_data BLOB NOT NULL,          -- float32 bytes of state vectors, row-major
+                    state_rows INTEGER,                -- state_data shape[0]
+                    state_cols INTEGER,                -- state_data shape[1]
+                    state_scale REAL,                  -- int16 quantization step; NULL for float32 states
+                    parameters TEXT,                   -- legacy JSON params, when p0/p1 can't hold them
+                    p0 REAL,                           -- first system parameter (e.g. k, omega)
+                    p1 REAL,                           -- second system parameter (e.g. m, zeta)
                     noise_level REAL DEFAULT 0.0,
                     dt REAL NOT NULL,
                     n_steps INTEGER NOT NULL,
@@ -48,130 +138,341 @@ class PhysicsDatabase:
                 );
             """)
             
-            conn.commit()
+            # Databases created before BLOB storage lack the shape columns
+            cursor.execute("PRAGMA table_info(trajectories)")
+            existing = {row[1] for row in cursor.fetchall()}
+            for column in ("state_rows", "state_cols"):
+                if column not in existing:
+                    cursor.execute(f"ALTER TABLE trajectories ADD COLUMN {column} INTEGER")
+            if "state_scale" not in existing:
+                cursor.execute("ALTER TABLE trajectories ADD COLUMN state_scale REAL")
+            
+            # ... and the p0/p1 parameter columns; backfill them once from the JSON params
+            if "p0" not in existing:
+                cursor.execute("ALTER TABLE trajectories ADD COLUMN p0 REAL")
+                cursor.execute("ALTER TABLE trajectories ADD COLUMN p1 REAL")
+                cursor.execute("SELECT id, parameters FROM systems WHERE parameters IS NOT NULL")
+                for system_id, parameters in cursor.fetchall():
+                    names = list(json.loads(parameters))
+                    if len(names) > 2:
+                        continue
+                    paths = [f'$."{name}"' for name in names] + [None] * (2 - len(names))
+                    cursor.execute("""
+                        UPDATE trajectories
+                        SET p0 = json_extract(parameters, ?), p1 = json_extract(parameters, ?)
+                        WHERE system_id = ? AND parameters IS NOT NULL
+                    """, (*paths, system_id))
+            
+            # Trajectories are almost always looked up by system
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_traj_system ON trajectories(system_id)")
     
     def add_system(self, name: str, equation: str, state_dim: int, 
                    parameters: Dict[str, Any] = None, description: str = None) -> int:
         """Add a new physical system to the database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR IGNORE INTO systems (name, equation, state_dim, parameters, description)
-                VALUES (?, ?, ?, ?, ?)
-            """, (name, equation, state_dim, 
-                  json.dumps(parameters) if parameters else None, description))
+        cursor = self._conn.cursor()
+        cursor.execute("""
+            INSERT OR IGNORE INTO systems (name, equation, state_dim, parameters, description)
+            VALUES (?, ?, ?, ?, ?)
+        """, (name, equation, state_dim, 
+              json.dumps(parameters) if parameters else None, description))
             
-            # Get the system ID
-            cursor.execute("SELECT id FROM systems WHERE name = ?", (name,))
-            return cursor.fetchone()[0]
+        return self.get_system_id(name)
+    
+    def get_system_id(self, name: str) -> Optional[int]:
+        """Look up a system's ID by name (served by the UNIQUE index on systems.name)."""
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT id FROM systems WHERE name = ? LIMIT 1", (name,))
+        row = cursor.fetchone()
+        return row[0] if row else None
     
     def add_trajectory(self, system_id: int, time_data: np.ndarray, 
                       state_data: np.ndarray, initial_conditions: np.ndarray,
                       dt: float, noise_level: float = 0.0, 
-                      parameters: Dict[str, Any] = None) -> int:
-        """Add a trajectory to the database."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO trajectories 
-                (system_id, initial_conditions, time_data, state_data, 
-                 parameters, noise_level, dt, n_steps)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+                      parameters: Union[Dict[str, float], Sequence[float]] = None,
+                      quantize: bool = False) -> int:
+        """
+        Add a trajectory to the database.
+        parameters is a dict keyed like the system's parameters, or up to two values in that order.
+        States are stored as float32, or as int16 with a per-trajectory scale when quantize=True.
+        """
+        state_data = np.ascontiguousarray(state_data, dtype=np.float32)
+        if state_data.ndim == 1:  # a scalar state per step is stored as one column
+            state_data = state_data[:, None]
+        state_blob, state_scale = _quantize(state_data) if quantize else (_to_blob(state_data), None)
+        cursor = self._conn.cursor()
+        cursor.execute("""
+            INSERT INTO trajectories 
+            (system_id, initial_conditions, time_data, state_data, 
+             state_rows, state_cols, state_scale, p0, p1, parameters, noise_level, dt, n_steps)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            system_id,
+            _to_blob(initial_conditions),
+            _to_blob(time_data),
+            state_blob,
+            state_data.shape[0],
+            state_data.shape[1],
+            state_scale,
+            *self._parameter_columns(system_id, parameters),
+            noise_level,
+            dt,
+            len(time_data)
+        ))
+        self._writes += 1
+        return cursor.lastrowid
+    
+    def add_trajectories(self, system_id: int, time_data: np.ndarray,
+                         state_data: np.ndarray, initial_conditions: np.ndarray,
+                         dt: float, noise_levels: np.ndarray = None,
+                         parameters: Sequence[Union[Dict[str, float], Sequence[float]]] = None,
+                         quantize: bool = False) -> List[int]:
+        """
+        Add a batch of trajectories that share one time grid in a single transaction.
+        state_data has shape (n_trajectories, n_steps, state_dim); returns the new IDs in order.
+        """
+        state_data = np.ascontiguousarray(state_data, dtype=np.float32)
+        n_trajectories, n_steps, state_dim = state_data.shape
+        if noise_levels is None:
+            noise_levels = np.zeros(n_trajectories)
+        if parameters is None:
+            parameters = [None] * n_trajectories
+        time_blob = _to_blob(time_data)
+        if quantize:
+            state_columns = [_quantize(states) for states in state_data]
+        else:
+            state_columns = [(_to_blob(states), None) for states in state_data]
+        
+        rows = [
+            (
                 system_id,
-                json.dumps(initial_conditions.tolist()),
-                json.dumps(time_data.tolist()),
-                json.dumps(state_data.tolist()),
-                json.dumps(parameters) if parameters else None,
-                noise_level,
+                _to_blob(initial_conditions[i]),
+                time_blob,
+                *state_columns[i],
+                n_steps,
+                state_dim,
+                *self._parameter_columns(system_id, parameters[i]),
+                float(noise_levels[i]),
                 dt,
-                len(time_data)
-            ))
-            return cursor.lastrowid
+                n_steps
+            )
+            for i in range(n_trajectories)
+        ]
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO trajectories 
+                (system_id, initial_conditions, time_data, state_data, state_scale,
+                 state_rows, state_cols, p0, p1, parameters, noise_level, dt, n_steps)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            # IDs are consecutive within one transaction
+            cursor.execute("SELECT last_insert_rowid()")
+            last_id = cursor.fetchone()[0]
+        self._writes += 1
+        return list(range(last_id - n_trajectories + 1, last_id + 1))
+    
+    def _system_info(self, system_id: int) -> Tuple[Optional[str], List[str]]:
+        """
+        Name and ordered parameter names of a system, cached per instance.
+        The parameter names (keys of the system's parameters JSON) give the
+        meaning of a trajectory's p0/p1 columns.
+        """
+        if system_id not in self._systems:
+            cursor = self._conn.cursor()
+            cursor.execute("SELECT name, parameters FROM systems WHERE id = ?", (system_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None, []
+            name, parameters = row
+            self._systems[system_id] = (name, list(json.loads(parameters)) if parameters else [])
+        return self._systems[system_id]
+    
+    def _parameter_columns(self, system_id: int,
+                           parameters: Union[Dict[str, float], Sequence[float], None]) -> tuple:
+        """
+        Map trajectory parameters onto the (p0, p1, parameters) columns.
+        Dicts are stored as p0/p1 in the system's parameter order; anything that does
+        not fit two slots falls back to the legacy JSON column.
+        """
+        if parameters is None or len(parameters) == 0:
+            return None, None, None
+        if isinstance(parameters, dict):
+            names = self._system_info(system_id)[1]
+            if len(names) > 2 or set(names) != set(parameters):
+                return None, None, json.dumps(parameters)
+            parameters = [parameters[name] for name in names]
+        if len(parameters) > 2:
+            raise ValueError(f"Expected at most 2 parameter values, got {len(parameters)}")
+        values = [float(value) for value in parameters] + [None] * (2 - len(parameters))
+        return values[0], values[1], None
+    
+    def _row_to_trajectory(self, description, row) -> Dict[str, Any]:
+        """Turn a SELECT * row from trajectories into a dict of numpy arrays."""
+        columns = [desc[0] for desc in description]
+        traj_data = dict(zip(columns, row))
+        
+        # Convert stored bytes (or legacy JSON strings) back to numpy arrays
+        traj_data['initial_conditions'] = _from_blob(traj_data['initial_conditions'])
+        traj_data['time_data'] = _from_blob(traj_data['time_data'])
+        traj_data['state_data'] = _from_blob(
+            traj_data['state_data'], (traj_data['state_rows'], traj_data['state_cols']),
+            traj_data['state_scale']
+        )
+        if traj_data['parameters']:
+            traj_data['parameters'] = json.loads(traj_data['parameters'])
+        elif traj_data['p0'] is not None:
+            names = self._system_info(traj_data['system_id'])[1] or ['p0', 'p1']
+            traj_data['parameters'] = dict(zip(names, (traj_data['p0'], traj_data['p1'])))
+        
+        return traj_data
     
     def get_trajectory(self, trajectory_id: int) -> Optional[Dict[str, Any]]:
         """Get trajectory data by ID - returns numpy arrays."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM trajectories WHERE id = ?", (trajectory_id,))
-            row = cursor.fetchone()
-            if row:
-                columns = [desc[0] for desc in cursor.description]
-                traj_data = dict(zip(columns, row))
-                
-                # Convert JSON strings back to numpy arrays
-                traj_data['initial_conditions'] = np.array(json.loads(traj_data['initial_conditions']))
-                traj_data['time_data'] = np.array(json.loads(traj_data['time_data']))
-                traj_data['state_data'] = np.array(json.loads(traj_data['state_data']))
-                if traj_data['parameters']:
-                    traj_data['parameters'] = json.loads(traj_data['parameters'])
-                
-                return traj_data
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT * FROM trajectories WHERE id = ?", (trajectory_id,))
+        row = cursor.fetchone()
+        if row:
+            return self._row_to_trajectory(cursor.description, row)
         return None
     
     def get_system_trajectories(self, system_id: int) -> List[Dict[str, Any]]:
         """Get all trajectories for a given system."""
-        trajectories = []
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id FROM trajectories WHERE system_id = ?", (system_id,))
-            for (traj_id,) in cursor.fetchall():
-                trajectories.append(self.get_trajectory(traj_id))
-        return trajectories
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT * FROM trajectories WHERE system_id = ? ORDER BY id", (system_id,))
+        return [self._row_to_trajectory(cursor.description, row) for row in cursor.fetchall()]
     
-    def get_training_data(self, system_id: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    def get_training_data(self, system_id: int = None, contiguous: bool = True):
         """
         Get all data formatted for AI training.
         Returns: (X, dX_dt) where X is states and dX_dt is derivatives.
+        With contiguous=False, returns per-trajectory lists instead of concatenating;
+        float32 states in those lists are read-only views of the stored bytes, not copies.
         """
-        all_states = []
-        all_derivatives = []
+        if not contiguous:
+            batches = [self._decode_training_rows(rows, as_view=True)
+                       for rows in self._training_row_groups(system_id, batch_size=1)]
+            return [states for states, _ in batches], [derivatives for _, derivatives in batches]
+        batches = list(self.iter_training_batches(system_id, batch_size=None))
+        if not batches:
+            return np.array([]), np.array([])
+        if len(batches) == 1:
+            return batches[0]
+        states, derivatives = zip(*batches)
+        return np.concatenate(states), np.concatenate(derivatives)
+    
+    def iter_training_batches(self, system_id: int = None, batch_size: Optional[int] = 8192,
+                              shard: Tuple[int, int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream training data as (X, dX_dt) batches instead of materializing it all.
+        Batches hold whole trajectories and at most batch_size points, unless a single
+        trajectory is longer; batch_size=None yields everything as one batch.
+        shard=(index, count) keeps only trajectories with id % count == index.
+        """
+        for rows in self._training_row_groups(system_id, batch_size, shard):
+            yield self._decode_training_rows(rows)
+    
+    def _training_row_groups(self, system_id: int = None, batch_size: Optional[int] = 8192,
+                             shard: Tuple[int, int] = None) -> Iterator[List[tuple]]:
+        """Group trajectory rows into the batches described in iter_training_batches."""
+        conditions, args = [], []
+        if system_id:
+            conditions.append("system_id = ?")
+            args.append(system_id)
+        if shard:
+            conditions.append("id % ? = ?")
+            args.extend((shard[1], shard[0]))
+        query = "SELECT state_data, state_scale, dt, n_steps, system_id, p0, p1, state_cols FROM trajectories"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            if system_id:
-                cursor.execute("SELECT id FROM trajectories WHERE system_id = ?", (system_id,))
-            else:
-                cursor.execute("SELECT id FROM trajectories")
-            
-            trajectory_ids = [row[0] for row in cursor.fetchall()]
+        cursor = self._conn.cursor()
+        cursor.execute(query + " ORDER BY id", args)
+        pending, n_points = [], 0
+        for row in cursor:
+            if pending and batch_size and n_points + row[3] > batch_size:
+                yield pending
+                pending, n_points = [], 0
+            pending.append(row)
+            n_points += row[3]
+        if pending:
+            yield pending
+    
+    def _decode_training_rows(self, rows: List[tuple],
+                              as_view: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decode trajectory rows from _training_row_groups into (X, dX_dt) arrays.
+        as_view=True lets a single float32 trajectory come back as a read-only view of
+        its BLOB; otherwise X is always a fresh, writable float32 array.
+        """
+        dts = np.array([row[2] for row in rows])
+        lengths = np.array([row[3] for row in rows])
+        # Legacy rows without a recorded shape are decoded to find their width
+        widths = {cols if cols is not None else _from_blob(data, (n_steps, -1), scale).shape[1]
+                  for data, scale, _, n_steps, _, _, _, cols in rows}
+        if len(widths) > 1:
+            raise ValueError(f"Cannot stack trajectories with different state dimensions {sorted(widths)}")
+        state_dim = widths.pop()
+        
+        if as_view and len(rows) == 1 and isinstance(rows[0][0], bytes) and rows[0][1] is None:
+            # A single float32 trajectory is used in place, as a view of its BLOB
+            all_states = _from_blob(rows[0][0], (lengths[0], -1))
+        else:
+            # Decode every trajectory straight into one pre-allocated buffer
+            all_states = np.empty((lengths.sum(), state_dim), dtype=np.float32)
+            offset = 0
+            for data, scale, _, n_steps, *_ in rows:
+                all_states[offset:offset + n_steps] = _from_blob(data, (n_steps, -1), scale)
+                offset += n_steps
+        
+        # Per-trajectory ODE coefficients; NaN where the system has no known equation
+        system_ids = np.array([row[4] for row in rows])
+        parameters = np.array([row[5:7] for row in rows], dtype=np.float32)  # NULL -> NaN
+        damping = np.full(len(rows), np.nan, dtype=np.float32)
+        stiffness = np.full(len(rows), np.nan, dtype=np.float32)
+        for trajectory_system in np.unique(system_ids):
+            name, names = self._system_info(int(trajectory_system))
+            coefficients = _OSCILLATOR_COEFFICIENTS.get(name)
+            if coefficients and names:
+                mask = system_ids == trajectory_system
+                damping[mask], stiffness[mask] = coefficients(dict(zip(names, parameters[mask].T)))
+        damping = np.repeat(damping, lengths)
+        stiffness = np.repeat(stiffness, lengths)
+        
+        all_derivatives = np.empty_like(all_states)
+        known = ~np.isnan(stiffness) & (state_dim == 2)
         
-        for traj_id in trajectory_ids:
-            traj = self.get_trajectory(traj_id)
-            if traj:
-                time_data = traj['time_data']
-                state_data = traj['state_data']
-                dt = traj['dt']
-                
-                # Calculate derivatives using finite differences
-                derivatives = np.gradient(state_data, dt, axis=0)
-                
-                all_states.extend(state_data)
-                all_derivatives.extend(derivatives)
+        # Evaluate the exact right-hand side [v, -damping*v - stiffness*x] on known systems' states
+        if known.any():
+            rows_known = slice(None) if known.all() else known
+            x, v = all_states[rows_known, 0], all_states[rows_known, 1]
+            all_derivatives[rows_known, 0] = v
+            all_derivatives[rows_known, 1] = -damping[rows_known] * v - stiffness[rows_known] * x
         
-        return np.array(all_states), np.array(all_derivatives)
+        # Fall back to finite differences for systems without a known equation
+        if not known.all():
+            all_derivatives[~known] = _segment_gradient(all_states, lengths, dts)[~known]
+        
+        return all_states, all_derivatives
     
     def list_systems(self) -> List[Dict[str, Any]]:
         """List all systems in the database."""
         systems = []
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name, equation, state_dim, description FROM systems")
-            columns = [desc[0] for desc in cursor.description]
-            for row in cursor.fetchall():
-                systems.append(dict(zip(columns, row)))
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT id, name, equation, state_dim, description FROM systems")
+        columns = [desc[0] for desc in cursor.description]
+        for row in cursor.fetchall():
+            systems.append(dict(zip(columns, row)))
         return systems
     
     def get_stats(self) -> Dict[str, int]:
         """Get database statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM systems")
-            n_systems = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM trajectories")
-            n_trajectories = cursor.fetchone()[0]
-            cursor.execute("SELECT SUM(n_steps) FROM trajectories")
-            total_points = cursor.fetchone()[0] or 0
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM systems")
+        n_systems = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM trajectories")
+        n_trajectories = cursor.fetchone()[0]
+        cursor.execute("SELECT SUM(n_steps) FROM trajectories")
+        total_points = cursor.fetchone()[0] or 0
             
         return {
             "systems": n_systems, 
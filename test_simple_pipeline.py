@@ -7,14 +7,47 @@ This demonstrates:
 3. Data loading (for AI training)
 """
 import sys
+import tempfile
+import numpy as np
 from pathlib import Path
 
 # Add src to path for imports
-ROOT = Path(__file__).resolve().parent
-sys.path.append(str(ROOT / "src"))
+ROOT = Path(__file__).parent
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
 
 from simulate.oscillators import simulate_simple_harmonic, simulate_damped_oscillator
 from dataloaders.database_physics_dataloader import PhysicsDataLoader
+from utils.enhanced_database import PhysicsDatabase
+
+def check_unknown_system_fallback():
+    """Systems without a known equation (here 1-D) must fall back to np.gradient."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = PhysicsDatabase(str(Path(tmp) / "check.sqlite"))
+        system_id = db.add_system(name="decay", equation="x' = -x", state_dim=1)
+        t = np.arange(100) * 0.01
+        states = np.exp(-t)[:, None]
+        db.add_trajectory(system_id, t, states, states[0], dt=0.01)
+        
+        loaded, derivatives = db.get_training_data(system_id)
+        expected = np.gradient(loaded, 0.01, axis=0)
+        assert derivatives.shape == (100, 1)
+        assert np.allclose(derivatives, expected), "1-D fallback derivatives differ from np.gradient"
+        
+        # A 2-D system alongside it cannot be stacked into one array
+        sho_id = db.add_system(name="simple_harmonic", equation="x'' = -k/m x", state_dim=2,
+                               parameters={"k": 1.0, "m": 1.0})
+        db.add_trajectory(sho_id, t, np.stack([np.cos(t), -np.sin(t)], axis=1), np.array([1.0, 0.0]),
+                          dt=0.01, parameters={"k": 1.0, "m": 1.0})
+        try:
+            db.get_training_data()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Mixed 1-D and 2-D trajectories were stacked without an error")
+        db.close()
+    print("✓ Unknown 1-D system falls back to finite differences")
+    print("✓ Mixed state dimensions are rejected")
 
 def main():
     print("🚀 Testing Streamlined Physics Data Pipeline")
@@ -59,6 +92,10 @@ def main():
     print(f"  Samples: {len(damped_states)}")
     print(f"  States range: [{damped_states[:,0].min():.3f}, {damped_states[:,0].max():.3f}]")
     
+    # 4. Check derivative fallback for systems without a known equation
+    print("\n4. Checking derivative fallback...")
+    check_unknown_system_fallback()
+    
     print("\n✅ Pipeline test complete!")
     print("💡 Data is ready for AI equation discovery models")
 